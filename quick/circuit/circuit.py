@@ -4328,7 +4328,8 @@ class Circuit(ABC):
         if isinstance(control_indices, int):
             control_indices = [control_indices]
 
-        angles_params = np.asarray(angles)
+        # The decomposition kernel is JIT-compiled and expects float64
+        angles_params = np.asarray(angles, dtype=np.float64)
 
         # Check if the number of angles is a power of 2
         is_power_of_2 = (angles_params.shape[0] & (angles_params.shape[0]-1) == 0) \
@@ -4369,11 +4370,10 @@ class Circuit(ABC):
             return
 
         # Decompose the multiplexor into single qubit rotations
+        # The arguments are passed positionally as the JIT dispatcher does
+        # not resolve keyword arguments
         angles_params = decompose_multiplexor_rotations(
-            angles=angles_params,
-            start_index=0,
-            end_index=len(angles_params),
-            reverse_decomposition=False
+            angles_params, 0, len(angles_params), False
         )
 
         # Apply the multiplexed Pauli rotations
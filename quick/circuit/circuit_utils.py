@@ -31,6 +31,11 @@ __all__ = [
 import numpy as np
 from numpy.typing import NDArray
 
+try:
+    from numba import njit # type: ignore
+except ImportError:
+    njit = None # type: ignore
+
 """ Constants for decomposing multiplexed RZ gates from Bergholm et al.
 These are the (0, 0) and (1, 1) elements of the RZ gate matrix with angle -pi/2
 Defined directly as complex numbers to avoid floating point errors
@@ -63,6 +68,9 @@ def decompose_multiplexor_rotations(
     Essentially, the circuit topology for the reversed decomposition is the reverse
     of the original decomposition.
 
+    The function is JIT-compiled with Numba when available, so `angles` must be
+    a float64 NumPy array rather than a plain list.
+
     Parameters
     ----------
     `angles` : NDArray[np.float64]
@@ -107,6 +115,12 @@ def decompose_multiplexor_rotations(
 
     return angles
 
+# `cache=True` is deliberately avoided here; reloading an on-disk cache of a
+# self-recursive function is broken in some Numba releases and crashes the
+# interpreter, so the function is recompiled once per process instead
+if njit is not None:
+    decompose_multiplexor_rotations = njit(decompose_multiplexor_rotations)
+
 def multiplexed_rz_angles(
         phi_1: float,
         phi_2: float
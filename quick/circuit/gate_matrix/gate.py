@@ -1,161 +1,378 @@
-# Copyright 2023-2024 Qualition Computing LLC.
-#
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#     https://github.com/Qualition/quick/blob/main/LICENSE
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-
-""" Module for generating the matrix representation of a quantum gate.
-"""
-
-from __future__ import annotations
-
-__all__ = ["Gate"]
-
-import numpy as np
-from numpy.typing import NDArray
-from typing import Literal
-
-from quick.predicates import is_unitary_matrix
-
-# Constant
-ZERO_PROJECTOR = np.array([
-    [1, 0],
-    [0, 0]
-])
-ONE_PROJECTOR = np.array([
-    [0, 0],
-    [0, 1]
-])
-
-
-class Gate:
-    """ `quick.gate_matrix.Gate` class represents a quantum gate. This class is used to
-    generate the matrix representation of a quantum gate for testing and classical simulation
-    purposes.
-
-    Parameters
-    ----------
-    `name`: str
-        The name of the gate.
-    `matrix`: NDArray[np.complex128]
-        The matrix representation of the gate.
-
-    Attributes
-    ----------
-    `name`: str
-        The name of the gate.
-    `matrix`: NDArray[np.complex128]
-        The matrix representation of the gate.
-
-    Raises
-    ------
-    ValueError
-        - If the matrix is not unitary.
-
-    Usage
-    -----
-    >>> gate = Gate("H", np.array([[1, 1],
-    ...                            [1, -1]]) / np.sqrt(2))
-    """
-    def __init__(
-            self,
-            name: str,
-            matrix: NDArray[np.complex128]
-        ) -> None:
-        """ Initialize a `quick.gate_matrix.Gate` instance.
-        """
-        self.name = name
-        self.matrix = matrix
-        if not is_unitary_matrix(matrix):
-            raise ValueError("The matrix must be unitary.")
-        self.num_qubits = int(np.log2(matrix.shape[0]))
-        self.ordering = "MSB"
-
-    def adjoint(self) -> NDArray[np.complex128]:
-        """ Generate the adjoint of the gate.
-
-        Returns
-        -------
-        NDArray[np.complex128]
-            The adjoint of the gate.
-        """
-        return self.matrix.T.conj()
-
-    def control(
-            self,
-            num_control_qubits: int
-        ) -> Gate:
-        """ Generate the matrix representation of a controlled version of the gate.
-
-        Parameters
-        ----------
-        `num_control_qubits`: int
-            The number of control qubits.
-
-        Returns
-        -------
-        `controlled_gate` : quick.gate_matrix.Gate
-            The controlled gate.
-
-        Raises
-        ------
-        TypeError
-            - If the number of control qubits is not an integer.
-        ValueError
-            - If the number of control qubits is less than 1.
-        """
-        if not isinstance(num_control_qubits, int):
-            raise TypeError("The number of control qubits must be an integer.")
-
-        if num_control_qubits < 1:
-            raise ValueError("The number of control qubits must be greater than 0.")
-
-        controlled_matrix = np.kron(ZERO_PROJECTOR, np.eye(2 ** num_control_qubits)) + \
-                            np.kron(ONE_PROJECTOR, self.matrix)
-        controlled_gate = Gate(f"C-{self.name}", controlled_matrix.astype(complex))
-
-        return controlled_gate
-
-    def change_mapping(
-            self,
-            ordering: Literal["MSB", "LSB"]
-        ) -> None:
-        """ Change the mapping of the qubits in the matrix representation of the gate.
-
-        Parameters
-        ----------
-        `ordering`: Literal["MSB", "LSB"]
-            The new qubit ordering.
-
-        Returns
-        -------
-        `reordered_matrix` : NDArray[np.complex128]
-            The new matrix with LSB conversion.
-
-        Raises
-        ------
-        ValueError
-            - If the ordering is not "MSB" or "LSB".
-        """
-        if ordering not in ["MSB", "LSB"]:
-            raise ValueError("The ordering must be either 'MSB' or 'LSB'.")
-
-        if ordering == self.ordering:
-            return
-
-        # Create a new matrix to store the reordered elements
-        dims = [2] * (self.num_qubits * 2)
-        reordered_matrix = self.matrix.reshape(dims).transpose().reshape(
-            (2**self.num_qubits, 2**self.num_qubits)
-        )
-
-        self.matrix = reordered_matrix
+# Copyright 2023-2024 Qualition Computing LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://github.com/Qualition/quick/blob/main/LICENSE
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Module for generating the matrix representation of a quantum gate.
+"""
+
+from __future__ import annotations
+
+__all__ = ["Gate"]
+
+from functools import lru_cache
+import numpy as np
+from numpy.typing import NDArray
+from typing import Literal
+
+from quick.predicates import is_unitary_matrix
+
+# Constants
+ZERO_PROJECTOR = np.array([
+    [1, 0],
+    [0, 0]
+], dtype=np.complex128)
+ONE_PROJECTOR = np.array([
+    [0, 0],
+    [0, 1]
+], dtype=np.complex128)
+
+
+# Minimum matrix size at which `change_mapping` switches to the tiled
+# bit-reversal scheme to avoid strided cache misses
+TILED_BIT_REVERSAL_THRESHOLD = 1 << 8
+
+# Lookup table mapping each byte to its bit-reversed counterpart
+_BYTE_REVERSAL_LUT = np.array(
+    [int(f"{byte:08b}"[::-1], 2) for byte in range(256)],
+    dtype=np.intp
+)
+
+# Identity templates reused by `control` across same-size calls; the
+# templates are read-only and copied before the gate block is written
+_IDENTITY_TEMPLATES: dict[int, NDArray[np.complex128]] = {}
+
+
+@lru_cache(maxsize=32)
+def _bit_reversal_permutation(num_bits: int) -> NDArray[np.intp]:
+    """ Compute the bit-reversal permutation for `num_bits` bits.
+
+    Notes
+    -----
+    The permutation only depends on the bit count, so it is cached and
+    shared across all gates of the same qubit count. Callers must treat
+    the returned array as read-only.
+
+    Parameters
+    ----------
+    `num_bits` : int
+        The number of bits in the indices.
+
+    Returns
+    -------
+    NDArray[np.intp]
+        The permutation mapping each index to its bit-reversed counterpart.
+    """
+    indices = np.arange(1 << num_bits, dtype=np.intp)
+
+    if num_bits <= 16:
+        # Reverse the two bytes through the lookup table, then shift out
+        # the bits the indices never used
+        reversed_indices = (
+            (_BYTE_REVERSAL_LUT[indices & 0xFF] << 8) | _BYTE_REVERSAL_LUT[indices >> 8]
+        ) >> (16 - num_bits)
+    else:
+        # Fold each bit into its mirrored position, using log(N) vectorized
+        # operations instead of N per-index reversals
+        reversed_indices = np.zeros_like(indices)
+        for bit in range(num_bits):
+            reversed_indices |= ((indices >> bit) & 1) << (num_bits - 1 - bit)
+
+    return reversed_indices
+
+
+def _bit_reverse_rows(matrix: NDArray[np.complex128]) -> NDArray[np.complex128]:
+    """ Gather the rows of `matrix` in bit-reversed order.
+
+    Notes
+    -----
+    For large matrices a single bit-reversed gather touches rows in a
+    cache-hostile stride pattern. Splitting the row index into its high
+    and low halves, bit-reversing each half separately, and swapping the
+    two halves performs the same permutation in sequential tile-sized
+    passes.
+
+    Parameters
+    ----------
+    `matrix` : NDArray[np.complex128]
+        The input matrix with a power-of-two number of rows.
+
+    Returns
+    -------
+    NDArray[np.complex128]
+        The matrix with its rows in bit-reversed order.
+    """
+    size = matrix.shape[0]
+    num_bits = size.bit_length() - 1
+
+    if size < TILED_BIT_REVERSAL_THRESHOLD:
+        return matrix[_bit_reversal_permutation(num_bits)]
+
+    high_bits = num_bits // 2
+    low_bits = num_bits - high_bits
+
+    # rev(high * 2^low + low) == rev(low) * 2^high + rev(high), so the full
+    # permutation is two small per-half gathers followed by a transpose of
+    # the (high, low) tiling
+    tiles = matrix.reshape(1 << high_bits, 1 << low_bits, -1)
+    tiles = tiles[_bit_reversal_permutation(high_bits)]
+    tiles = tiles[:, _bit_reversal_permutation(low_bits)]
+
+    return np.ascontiguousarray(tiles.swapaxes(0, 1)).reshape(size, -1)
+
+
+def _bit_reverse_matrix(matrix: NDArray[np.complex128]) -> NDArray[np.complex128]:
+    """ Gather the rows and columns of `matrix` in bit-reversed order.
+
+    Parameters
+    ----------
+    `matrix` : NDArray[np.complex128]
+        The input matrix with power-of-two dimensions.
+
+    Returns
+    -------
+    NDArray[np.complex128]
+        The matrix with rows and columns in bit-reversed order.
+    """
+    if matrix.shape[0] >= TILED_BIT_REVERSAL_THRESHOLD:
+        # Reorder the rows and columns in separate contiguous passes
+        reordered_matrix = _bit_reverse_rows(matrix)
+        reordered_matrix = _bit_reverse_rows(np.ascontiguousarray(reordered_matrix.T)).T
+        return np.ascontiguousarray(reordered_matrix)
+
+    # Reindex the rows and columns by their bit-reversed counterparts
+    # in a single contiguous gather
+    permutation = _bit_reversal_permutation(matrix.shape[0].bit_length() - 1)
+    return matrix[np.ix_(permutation, permutation)]
+
+
+class Gate:
+    """ `quick.gate_matrix.Gate` class represents a quantum gate. This class is used to
+    generate the matrix representation of a quantum gate for testing and classical simulation
+    purposes.
+
+    Parameters
+    ----------
+    `name`: str
+        The name of the gate.
+    `matrix`: NDArray[np.complex128]
+        The matrix representation of the gate.
+
+    Attributes
+    ----------
+    `name`: str
+        The name of the gate.
+    `matrix`: NDArray[np.complex128]
+        The matrix representation of the gate.
+
+    Raises
+    ------
+    ValueError
+        - If the matrix is not unitary.
+
+    Usage
+    -----
+    >>> gate = Gate("H", np.array([[1, 1],
+    ...                            [1, -1]]) / np.sqrt(2))
+    """
+    # Declared at class level so the `matrix` setter (which runs before
+    # `__init__` finishes) assigns to already-typed attributes
+    ordering: Literal["MSB", "LSB"]
+    _matrix: NDArray[np.complex128]
+    _reordered_matrix: NDArray[np.complex128] | None
+    _is_diagonal: bool | None
+
+    def __init__(
+            self,
+            name: str,
+            matrix: NDArray[np.complex128]
+        ) -> None:
+        """ Initialize a `quick.gate_matrix.Gate` instance.
+        """
+        # Normalize to C-contiguous complex128 once at ingress so every
+        # downstream BLAS call hits the fast path
+        matrix = np.ascontiguousarray(matrix, dtype=np.complex128)
+
+        self.name = name
+        self.matrix = matrix
+        if not is_unitary_matrix(matrix):
+            raise ValueError("The matrix must be unitary.")
+        self.num_qubits = matrix.shape[0].bit_length() - 1
+
+    @classmethod
+    def _unchecked(
+            cls,
+            name: str,
+            matrix: NDArray[np.complex128]
+        ) -> Gate:
+        """ Construct a gate from a matrix that is known to be unitary,
+        skipping the unitarity check.
+
+        Notes
+        -----
+        The unitarity check costs a full matrix product. Internal callers
+        that build the matrix from already-unitary pieces (e.g. `control`)
+        use this constructor to avoid paying that cost again.
+
+        Parameters
+        ----------
+        `name`: str
+            The name of the gate.
+        `matrix`: NDArray[np.complex128]
+            The unitary matrix representation of the gate.
+
+        Returns
+        -------
+        `gate` : quick.gate_matrix.Gate
+            The gate instance.
+        """
+        gate = cls.__new__(cls)
+        gate.name = name
+        gate.matrix = matrix
+        gate.num_qubits = matrix.shape[0].bit_length() - 1
+        return gate
+
+    @property
+    def matrix(self) -> NDArray[np.complex128]:
+        """ The matrix representation of the gate in the current ordering.
+
+        The matrix is stored in MSB ordering, and the bit-reversed variant
+        is only materialized (and cached) when the gate is in LSB ordering
+        and the matrix is actually accessed.
+
+        Returns
+        -------
+        NDArray[np.complex128]
+            The matrix representation of the gate.
+        """
+        # Single-qubit matrices have no bits to reverse, so both orderings
+        # share the same matrix
+        if self.ordering == "MSB" or self.num_qubits <= 1:
+            return self._matrix
+
+        if self._reordered_matrix is None:
+            self._reordered_matrix = _bit_reverse_matrix(self._matrix)
+
+        return self._reordered_matrix
+
+    @matrix.setter
+    def matrix(self, matrix: NDArray[np.complex128]) -> None:
+        # A newly assigned matrix is taken as-is in MSB ordering, and any
+        # pending reordering of the previous matrix no longer applies
+        self._matrix = matrix
+        self._reordered_matrix = None
+        self._is_diagonal = None
+        self.ordering = "MSB"
+
+    def adjoint(self) -> NDArray[np.complex128]:
+        """ Generate the adjoint of the gate.
+
+        Notes
+        -----
+        The returned array is a transposed view of a single conjugated
+        copy; conjugating first and transposing last avoids materializing
+        a second full-size array.
+
+        Returns
+        -------
+        NDArray[np.complex128]
+            The adjoint of the gate.
+        """
+        if self._is_diagonal is None:
+            matrix = self._matrix
+            self._is_diagonal = bool(
+                np.count_nonzero(matrix - np.diag(matrix.diagonal())) == 0
+            )
+
+        # The adjoint of a diagonal matrix only needs the conjugated diagonal
+        if self._is_diagonal:
+            return np.diag(self.matrix.diagonal().conj())
+
+        return self.matrix.conj().T
+
+    def control(
+            self,
+            num_control_qubits: int
+        ) -> Gate:
+        """ Generate the matrix representation of a controlled version of the gate.
+
+        Parameters
+        ----------
+        `num_control_qubits`: int
+            The number of control qubits.
+
+        Returns
+        -------
+        `controlled_gate` : quick.gate_matrix.Gate
+            The controlled gate.
+
+        Raises
+        ------
+        TypeError
+            - If the number of control qubits is not an integer.
+        ValueError
+            - If the number of control qubits is less than 1.
+        """
+        if not isinstance(num_control_qubits, int):
+            raise TypeError("The number of control qubits must be an integer.")
+
+        if num_control_qubits < 1:
+            raise ValueError("The number of control qubits must be greater than 0.")
+
+        # The controlled matrix is block-diagonal, diag(I, U), so it can be
+        # written directly as an identity with the gate copied into the
+        # lower-right block instead of materializing two Kronecker products
+        dim = self.matrix.shape[0]
+        controlled_dim = dim * (2 ** num_control_qubits)
+
+        template = _IDENTITY_TEMPLATES.get(controlled_dim)
+        if template is None:
+            template = np.eye(controlled_dim, dtype=np.complex128)
+            _IDENTITY_TEMPLATES[controlled_dim] = template
+
+        # Copying the cached template is a single memcpy, cheaper than
+        # rebuilding the identity on every call
+        controlled_matrix = template.copy()
+        controlled_matrix[controlled_dim - dim:, controlled_dim - dim:] = self.matrix
+
+        # The controlled matrix is unitary by construction, so the
+        # unitarity check can be skipped
+        controlled_gate = Gate._unchecked(f"C-{self.name}", controlled_matrix)
+
+        return controlled_gate
+
+    def change_mapping(
+            self,
+            ordering: Literal["MSB", "LSB"]
+        ) -> None:
+        """ Change the mapping of the qubits in the matrix representation of the gate.
+
+        Notes
+        -----
+        Changing the ordering only flips a flag; the reordered matrix is
+        materialized lazily on the next `matrix` access, and not at all if
+        the matrix is never read in the new ordering.
+
+        Parameters
+        ----------
+        `ordering`: Literal["MSB", "LSB"]
+            The new qubit ordering.
+
+        Raises
+        ------
+        ValueError
+            - If the ordering is not "MSB" or "LSB".
+        """
+        if ordering not in ["MSB", "LSB"]:
+            raise ValueError("The ordering must be either 'MSB' or 'LSB'.")
+
         self.ordering = ordering
\ No newline at end of file
@@ -19,16 +19,80 @@ from __future__ import annotations
 
 __all__ = ["OneQubitDecomposition"]
 
+import cmath
 from collections.abc import Sequence
+import math
 import numpy as np
 from numpy.typing import NDArray
-from typing import Literal, SupportsIndex, TYPE_CHECKING
+from typing import Literal, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from quick.circuit import Circuit
 from quick.primitives import Operator
 from quick.synthesis.unitarypreparation import UnitaryPreparation
 
+try:
+    from numba import njit # type: ignore
+except ImportError:
+    njit = None # type: ignore
+
+
+def _params_zyz_kernel(
+        u00: complex,
+        u01: complex,
+        u10: complex,
+        u11: complex
+    ) -> tuple[float, float, float, float]:
+    """ Calculate the ZYZ decomposition angles from the four entries
+    of a 2x2 unitary matrix.
+
+    Notes
+    -----
+    This is the scalar hot path of `params_zyz`, kept free of NumPy
+    objects so it can be JIT-compiled with Numba when available.
+
+    Parameters
+    ----------
+    `u00` : complex
+        The (0, 0) entry of the unitary matrix.
+    `u01` : complex
+        The (0, 1) entry of the unitary matrix.
+    `u10` : complex
+        The (1, 0) entry of the unitary matrix.
+    `u11` : complex
+        The (1, 1) entry of the unitary matrix.
+
+    Returns
+    -------
+    `alpha` : float
+        The global phase.
+    `theta` : float
+        The angle of the Y rotation.
+    `phi` : float
+        The angle of the first Z rotation.
+    `lam` : float
+        The angle of the second Z rotation.
+    """
+    det = u00 * u11 - u01 * u10
+
+    # Calculate the principal argument of the determinant
+    det_arg = cmath.phase(det)
+
+    # Calculate the global phase
+    alpha = 0.5 * det_arg
+
+    # Calculate the ZYZ decomposition
+    theta = 2. * math.atan2(abs(u10), abs(u00))
+    angle_1 = cmath.phase(u11)
+    angle_2 = cmath.phase(u10)
+    phi = angle_1 + angle_2 - det_arg
+    lam = angle_1 - angle_2
+
+    return alpha, theta, phi, lam
+
+if njit is not None:
+    _params_zyz_kernel = njit(cache=True)(_params_zyz_kernel)
+
 
 class OneQubitDecomposition(UnitaryPreparation):
     """ `quick.synthesis.unitarypreparation.OneQubitDecomposition` is the class for decomposing
@@ -121,23 +185,85 @@ class OneQubitDecomposition(UnitaryPreparation):
         `lam` : float
             The angle of the second Z rotation.
         """
-        det_arg = OneQubitDecomposition.one_qubit_det(U)
+        alpha, theta, phi, lam = _params_zyz_kernel(
+            complex(U[0, 0]), complex(U[0, 1]),
+            complex(U[1, 0]), complex(U[1, 1])
+        )
+
+        return alpha, (theta, phi, lam)
+
+    @staticmethod
+    def params_zyz_batch(
+            U: NDArray[np.complex128]
+        ) -> tuple[NDArray[np.float64], tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]]:
+        """ Calculate the ZYZ decomposition of a batch of 2x2 unitary matrices.
+
+        Notes
+        -----
+        This is the vectorized counterpart of `params_zyz`. All angles are
+        computed with NumPy ufuncs over the batch axis, so the per-call
+        dispatch overhead is paid once for the whole batch instead of once
+        per matrix.
+
+        Parameters
+        ----------
+        `U` : NDArray[np.complex128]
+            Batch of 2x2 unitary matrices with shape (B, 2, 2).
+
+        Returns
+        -------
+        `alpha` : NDArray[np.float64]
+            The global phases.
+        `theta` : NDArray[np.float64]
+            The angles of the Y rotations.
+        `phi` : NDArray[np.float64]
+            The angles of the first Z rotations.
+        `lam` : NDArray[np.float64]
+            The angles of the second Z rotations.
+        """
+        det = U[..., 0, 0] * U[..., 1, 1] - U[..., 0, 1] * U[..., 1, 0]
 
-        # Calculate the principal argument of the determinant
-        det_arg = np.arctan2(det_arg.imag, det_arg.real)
+        # Calculate the principal argument of the determinants
+        det_arg = np.arctan2(det.imag, det.real)
 
-        # Calculate the global phase
+        # Calculate the global phases
         alpha = 0.5 * det_arg
 
-        # Calculate the ZYZ decomposition
-        theta = 2. * np.arctan2(np.abs(U[1, 0]), np.abs(U[0, 0]))
-        angle_1 = np.arctan2(U[1, 1].imag, U[1, 1].real)
-        angle_2 = np.arctan2(U[1, 0].imag, U[1, 0].real)
+        # Calculate the ZYZ decompositions
+        theta = 2. * np.arctan2(np.abs(U[..., 1, 0]), np.abs(U[..., 0, 0]))
+        angle_1 = np.arctan2(U[..., 1, 1].imag, U[..., 1, 1].real)
+        angle_2 = np.arctan2(U[..., 1, 0].imag, U[..., 1, 0].real)
         phi = angle_1 + angle_2 - det_arg
         lam = angle_1 - angle_2
 
         return alpha, (theta, phi, lam)
 
+    @staticmethod
+    def params_u3_batch(
+            U: NDArray[np.complex128]
+        ) -> tuple[NDArray[np.float64], tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]]:
+        """ Calculate the U3 parameters for a batch of 2x2 unitary matrices.
+
+        Parameters
+        ----------
+        `U` : NDArray[np.complex128]
+            Batch of 2x2 unitary matrices with shape (B, 2, 2).
+
+        Returns
+        -------
+        `phase` : NDArray[np.float64]
+            The global phases.
+        `theta` : NDArray[np.float64]
+            The angles of the Y rotations.
+        `phi` : NDArray[np.float64]
+            The angles of the first Z rotations.
+        `lam` : NDArray[np.float64]
+            The angles of the second Z rotations.
+        """
+        alpha, (theta, phi, lam) = OneQubitDecomposition.params_zyz_batch(U)
+        phase = alpha - (phi + lam) / 2
+        return phase, (theta, phi, lam)
+
     @staticmethod
     def params_u3(U: NDArray[np.complex128]) -> tuple[float, tuple[float, float, float]]:
         """ Calculate the U3 parameters to implement a 2x2 unitary matrix.
@@ -166,7 +292,12 @@ class OneQubitDecomposition(UnitaryPreparation):
         `phase` : float
             The global phase.
         """
-        alpha, (theta, phi, lam) = OneQubitDecomposition.params_zyz(U)
+        # Call the shared ZYZ kernel directly instead of going through
+        # params_zyz, avoiding a redundant call frame and tuple repacking
+        alpha, theta, phi, lam = _params_zyz_kernel(
+            complex(U[0, 0]), complex(U[0, 1]),
+            complex(U[1, 0]), complex(U[1, 1])
+        )
         phase = alpha - (phi + lam) / 2
         return phase, (theta, phi, lam)
 
@@ -198,8 +329,11 @@ class OneQubitDecomposition(UnitaryPreparation):
             - If the number of qubit indices is not equal to 1.
             - If the unitary matrix is not a 2x2 matrix.
         """
-        if isinstance(qubit_indices, SupportsIndex):
-            qubit_indices = [qubit_indices]
+        # The Sequence check is cheap on this per-gate path (ABC results
+        # are cached per type) and, unlike the SupportsIndex dispatch it
+        # replaced, narrows the type for the index accesses below
+        if not isinstance(qubit_indices, Sequence):
+            qubit_indices = (int(qubit_indices),)
 
         if len(qubit_indices) != 1:
             raise ValueError(
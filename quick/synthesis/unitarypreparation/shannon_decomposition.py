@@ -1,476 +1,845 @@
-# Copyright 2023-2024 Qualition Computing LLC.
-#
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#     https://github.com/Qualition/quick/blob/main/LICENSE
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-
-""" Shende's Shannon decomposition for preparing quantum unitary operators
-using multiplexed RY and RZ gates.
-"""
-
-from __future__ import annotations
-
-__all__ = ["ShannonDecomposition"]
-
-from collections.abc import Sequence
-import numpy as np
-from numpy.typing import NDArray
-import scipy.linalg # type: ignore
-from typing import SupportsIndex, TYPE_CHECKING
-
-import quick
-if TYPE_CHECKING:
-    from quick.circuit import Circuit
-from quick.circuit.circuit_utils import decompose_multiplexor_rotations
-from quick.predicates import is_hermitian_matrix
-from quick.primitives import Operator
-from quick.synthesis.unitarypreparation import UnitaryPreparation
-
-# Constants
-QUBIT_KEYS = frozenset([
-    "qubit_index", "control_index", "target_index"
-])
-
-
-class ShannonDecomposition(UnitaryPreparation):
-    """ `quick.ShannonDecomposition` is the class for preparing quantum operators
-    using Shannon decomposition.
-
-    Notes
-    -----
-    Shende's Shannon decomposition uses multiplexed RY and RZ gates to prepare the unitary
-    operator. This method scales exponentially with the number of qubits in terms of circuit
-    depth.
-
-    ```
-       ┌───┐               ┌───┐     ┌───┐     ┌───┐
-      ─┤   ├─       ───────┤ Rz├─────┤ Ry├─────┤ Rz├─────
-       │   │    ≃     ┌───┐└─┬─┘┌───┐└─┬─┘┌───┐└─┬─┘┌───┐
-     /─┤   ├─       /─┤   ├──□──┤   ├──□──┤   ├──□──┤   ├
-       └───┘          └───┘     └───┘     └───┘     └───┘
-    ```
-
-    The number of CX gates generated with the decomposition without optimizations is,
-
-    .. math::
-
-        \frac{9}{16} 4^n - \frac{3}{2} 2^n
-
-    With A.1 optimization the CX count is reduced by,
-
-    .. math::
-
-        \frac{1}{3} 4^{n - 2} - 1.
-
-    With A.2 optimization the CX count is reduced by,
-
-    .. math::
-
-        4^{n-2} - 1.
-
-    Both A.1 and A.2 optimizations are applied by default.
-
-    For more information on Shannon decomposition:
-    [1] Shende, Bullock, Markov.
-    Synthesis of Quantum Logic Circuits (2004)
-    https://arxiv.org/abs/quant-ph/0406176
-
-    Parameters
-    ----------
-    `output_framework` : type[quick.circuit.Circuit]
-        The quantum circuit framework.
-
-    Attributes
-    ----------
-    `output_framework` : type[quick.circuit.Circuit]
-        The quantum circuit framework.
-
-    Raises
-    ------
-    TypeError
-        - If the output framework is not a subclass of `quick.circuit.Circuit`.
-    """
-    def __init__(
-            self,
-            output_framework: type[Circuit]
-        ) -> None:
-
-        super().__init__(output_framework)
-
-        self.one_qubit_decomposition = quick.synthesis.gate_decompositions.OneQubitDecomposition(output_framework)
-        self.two_qubit_decomposition = quick.synthesis.gate_decompositions.TwoQubitDecomposition(output_framework)
-
-    def apply_unitary(
-            self,
-            circuit: Circuit,
-            unitary: NDArray[np.complex128] | Operator,
-            qubit_indices: int | Sequence[int]
-        ) -> Circuit:
-
-        if not isinstance(unitary, (np.ndarray, Operator)):
-            try:
-                unitary = np.array(unitary).astype(complex)
-            except (ValueError, TypeError):
-                raise TypeError(
-                    "The operator must be a numpy array or an Operator object. "
-                    f"Received {type(unitary)} instead."
-                )
-
-        if isinstance(unitary, np.ndarray):
-            unitary = Operator(unitary)
-
-        if isinstance(qubit_indices, SupportsIndex):
-            qubit_indices = [qubit_indices]
-
-        if not all(isinstance(qubit_index, SupportsIndex) for qubit_index in qubit_indices):
-            raise TypeError("All qubit indices must be integers.")
-
-        if not len(qubit_indices) == unitary.num_qubits:
-            raise ValueError("The number of qubit indices must match the number of qubits in the unitary.")
-
-        a2_qsd_blocks: list[list[int]] = []
-
-        def quantum_shannon_decomposition(
-                circuit: Circuit,
-                qubit_indices: list[int],
-                unitary: NDArray[np.complex128],
-                recursion_depth: int=0
-            ) -> None:
-            """ Decompose n-qubit unitary into CX/RY/RZ/CX gates, preserving global phase.
-
-            Notes
-            -----
-            Using cosine-sine decomposition, the unitary matrix is decomposed into a series of
-            single-qubit rotations and CX gates. The most significant qubit is then decomposed
-            into a series of RY rotations and CX gates, and the process is repeated recursively
-            until the unitary is fully decomposed.
-
-            ```
-              ┌───┐               ┌───┐
-            ──┤   ├──      ────□──┤ Ry├──□───
-              │ U │    =     ┌─┴─┐└─┬─┘┌─┴─┐
-            /─┤   ├──      /─┤ U ├──□──┤ V ├─
-              └───┘          └───┘     └───┘
-            ```
-
-            Parameters
-            ----------
-            `circuit` : quick.circuit.Circuit
-                Quantum circuit to append operations to.
-            `qubit_indices` : list[int]
-                The qubits to apply the unitary to.
-            `unitary` : NDArray[np.complex128]
-                N-qubit unitary matrix to be decomposed.
-            `recursion_depth` : int, optional, default=0
-                The current recursion depth.
-
-            Raises
-            ------
-            ValueError
-                - If the u matrix is non-unitary
-                - If the u matrix is not of shape (2^n,2^n)
-            """
-            dim = unitary.shape[0]
-
-            # Explicit decomposition for one and two qubit unitaries
-            # This is the base case for the recursion
-            if dim == 2:
-                self.one_qubit_decomposition.apply_unitary(circuit, unitary, qubit_indices)
-                return
-
-            elif dim == 4:
-                current_index = len(circuit.circuit_log)
-                self.two_qubit_decomposition.apply_unitary(circuit, unitary, qubit_indices)
-
-                # Store the block for A.2 optimization
-                if recursion_depth > 0:
-                    a2_qsd_blocks.append([current_index, len(circuit.circuit_log)])
-
-                return
-
-            # Perform cosine-sine decomposition per Theorem 10
-            (u1, u2), theta, (v1, v2) = scipy.linalg.cossin(unitary, separate=True, p=dim//2, q=dim//2)
-
-            # Left multiplexed circuit
-            demultiplexor(circuit, qubit_indices, v1, v2, recursion_depth)
-
-            # Perform A.1 optimization from Shende et al.
-            # This optimization reduces the number of CX gates by 1/3 * 4^(n-2) - 1
-            num_angles = len(theta)
-
-            # The multiplexed RY gate is replaced by its equivalent CZ-RY gate
-            # and merge final CZ gate with the neighboring right-side generic
-            # multiplexer to apply A.1 optimization
-            # This removes one CX gate at each step of the recursion
-            ucry_to_cz_ry(circuit, qubit_indices[:-1], qubit_indices[-1], (2 * theta).tolist())
-            u2[:, num_angles // 2:] = np.negative(u2[:, num_angles // 2:])
-
-            # Right multiplexed circuit
-            demultiplexor(circuit, qubit_indices, u1, u2, recursion_depth)
-
-            # Once the recursion reaches the base case, apply the A.2 optimization
-            # to reduce the number of CX gates by 4^(n-2) - 1
-            if recursion_depth == 0:
-                a2_optimization(circuit, a2_qsd_blocks)
-
-        def demultiplexor(
-                circuit: Circuit,
-                demux_qubits: list[int],
-                unitary_1: NDArray[np.complex128],
-                unitary_2: NDArray[np.complex128],
-                recursion_depth: int=0
-            ) -> None:
-            """ Decompose a multiplexor defined by a pair of unitary matrices operating on
-            the same subspace per Theorem 12.
-
-            That is, decompose
-
-            ```
-              ctrl     ────□────
-                        ┌──┴──┐
-              target  /─┤     ├─
-                        └─────┘
-            ```
-
-            represented by the block diagonal matrix
-
-            ```
-                ┏         ┓
-                ┃ U1      ┃
-                ┃      U2 ┃
-                ┗         ┛
-            ```
-
-            to
-
-            ```
-                             ┌───┐
-              ctrl    ───────┤ Rz├──────
-                        ┌───┐└─┬─┘┌───┐
-              target  /─┤ W ├──□──┤ V ├─
-                        └───┘     └───┘
-            ```
-
-            by means of simultaneous unitary diagonalization.
-
-            Parameters
-            ----------
-            `circuit` : quick.circuit.Circuit
-                Quantum circuit to append operations to.
-            `demux_qubits` : list[int]
-                Subset of total qubits involved in this unitary gate.
-            `unitary_1` : NDArray[np.complex128]
-                Upper-left quadrant of total unitary to be decomposed (see diagram).
-            `unitary_2` : NDArray[np.complex128]
-                Lower-right quadrant of total unitary to be decomposed (see diagram).
-            `recursion_depth` : int, optional, default=0
-                The current recursion depth.
-            """
-            # Compute the product of `unitary_1` and the conjugate transpose of `unitary_2`
-            u = unitary_1 @ unitary_2.conj().T
-
-            # Perform eigenvalue decomposition to find the eigenvalues and eigenvectors of u
-            # This step is crucial because it allows us to express the unitary transformation
-            # in terms of its eigenvalues and eigenvectors, which simplifies further calculations
-            if is_hermitian_matrix(u):
-                eigenvalues, eigenvectors = scipy.linalg.eigh(u)
-            else:
-                # If the matrix is not Hermitian, use the Schur decomposition
-                # to compute the eigenvalues and eigenvectors
-                eigenvalues, eigenvectors = scipy.linalg.schur(u, output="complex") # type: ignore
-                eigenvalues = eigenvalues.diagonal()
-
-            # Take the square root of the eigenvalues to obtain the singular values
-            # This is necessary because the singular values provide a more convenient form
-            # for constructing the diagonal matrix D, which is used in the final decomposition
-            # We need to use `np.emath.sqrt` to handle negative eigenvalues
-            eigenvalues_sqrt = np.emath.sqrt(eigenvalues)
-
-            # Create a diagonal matrix D from the singular values
-            # The diagonal matrix D is used to scale the eigenvectors appropriately in the final step
-            diagonal = np.diag(eigenvalues_sqrt)
-
-            # Compute the matrix W using D, the conjugate transpose of V, and `unitary_2`
-            # This step combines the scaled eigenvectors with the original unitary matrix to
-            # achieve the desired decomposition
-            W = diagonal @ eigenvectors.conj().T @ unitary_2
-
-            # Apply the left gate
-            quantum_shannon_decomposition(circuit, demux_qubits[:-1], W, recursion_depth + 1)
-
-            # Apply multiplexed RZ gate
-            angles = (2 * np.angle(
-                np.conj(eigenvalues_sqrt)
-            )).tolist()
-
-            circuit.UCRZ(angles, demux_qubits[:-1], demux_qubits[-1])
-
-            # Apply the right gate
-            quantum_shannon_decomposition(circuit, demux_qubits[:-1], eigenvectors.astype(complex), recursion_depth + 1)
-
-        def ucry_to_cz_ry(
-                circuit: Circuit,
-                control_indices: int | list[int],
-                target_index: int,
-                angles: NDArray[np.float64]
-            ) -> None:
-            """ Get the multiplexed RY gate in terms of CZ-RY. This
-            is used in the A.1 optimization.
-
-            Notes
-            -----
-            As the initial controlled-Z gate is diagonal, it may be absorbed into the
-            neighboring generic multiplexor. This saves one CX gate at each step of the
-            recursion, for the total savings of (4^(n-l) -1)/3 CX gates.
-
-            Parameters
-            ----------
-            `circuit` : quick.circuit.Circuit
-                Quantum circuit to append operations to.
-            `control_indices` : int | list[int]
-                List of control qubits for the CZ gate.
-            `target_index` : int
-                Target qubit for the CZ gate.
-            `angles` : NDArray[np.float64]
-                List of angles for the RY gates.
-            """
-            num_angles = len(angles)
-
-            if isinstance(control_indices, int):
-                control_indices = [control_indices]
-
-            # If there are no control qubits, apply the RY gate directly
-            # to the target qubit
-            if not control_indices:
-                circuit.RY(angles[0], target_index)
-                return
-
-            # Calculate rotation angles for a multiplexed Pauli Rotation gate
-            # with a CX gate at the end of the circuit
-            angles = decompose_multiplexor_rotations(angles, 0, len(angles), False)
-
-            for i, angle in enumerate(angles):
-                circuit.RY(angle, target_index)
-
-                if not i == len(angles) - 1:
-                    binary_rep = np.binary_repr(i + 1)
-                    control_index = len(binary_rep) - len(binary_rep.rstrip("0"))
-                else:
-                    # Handle special case for last angle
-                    control_index = len(control_indices) - 1
-
-                # Leave off last CZ for merging with neighboring multiplexor as part
-                # of A.1 optimization
-                if i < num_angles - 1:
-                    circuit.CZ(control_indices[control_index], target_index)
-
-        def a2_optimization(
-                circuit: Circuit,
-                a2_qsd_blocks: list[list[int]]
-            ) -> None:
-            """ Extract diagonals to improve decomposition of two-qubit gates. This
-            is used in the A.2 optimization.
-
-            Notes
-            -----
-            We use Theorem 14 to decompose the rightmost two-qubit operator; migrate
-            the diagonal through the select bits of the multiplexor to the left, and
-            join it with the two-qubit operator on the other side.
-
-            Now we decompose this operator, and continue the process. Since we save
-            one CX in the implementation of every two-qubit gate but the last, we
-            improve the l = 2, c_l = 3 count by 4^(n - 2) - 1 gates.
-
-            Parameters
-            ----------
-            `circuit` : quick.circuit.Circuit
-                Quantum circuit to append operations to.
-            `a2_qsd_blocks` : list[list[int]]
-                List of blocks to apply A.2 optimization to.
-            """
-            # If there are no blocks, or only one block which means
-            # no neighbors to merge diagonal into, then return
-            if len(a2_qsd_blocks) < 2:
-                return
-
-            # Break apart the circuit into the blocks that need to be changed
-            # and the blocks that will remain the same
-            qsd_blocks: list[list[dict]] = []
-            circuit_blocks: list[list[dict]] = []
-
-            circuit_blocks.append(circuit.circuit_log[:a2_qsd_blocks[0][0]])
-
-            for block_index, block in enumerate(a2_qsd_blocks[:-1]):
-                qsd_blocks.append(circuit.circuit_log[block[0]:block[1]])
-                circuit_blocks.append(circuit.circuit_log[block[1]:a2_qsd_blocks[block_index + 1][0]])
-
-            qsd_blocks.append(circuit.circuit_log[a2_qsd_blocks[-1][0]:a2_qsd_blocks[-1][1]])
-            circuit_blocks.append(circuit.circuit_log[a2_qsd_blocks[-1][1]:])
-
-            # Extract the blocks from the circuit
-            for block_index in range(len(qsd_blocks) - 1):
-                circuit_1 = self.output_framework(2)
-                circuit_2 = self.output_framework(2)
-
-                circuit_1.circuit_log = qsd_blocks[block_index]
-                circuit_2.circuit_log = qsd_blocks[block_index + 1]
-
-                # Update the circuit to reconstruct the circuit from the modified circuit log
-                # As mentioned, we need to map the qubits to 0 and 1 to extract the 4x4 unitaries
-                if block_index == 0:
-                    for operation in circuit_1.circuit_log:
-                        for key in set(operation.keys()).intersection(QUBIT_KEYS):
-                            operation[key] = 0 if operation[key] == qubit_indices[0] else 1
-
-                for operation in circuit_2.circuit_log:
-                    for key in set(operation.keys()).intersection(QUBIT_KEYS):
-                        operation[key] = 0 if operation[key] == qubit_indices[0] else 1
-
-                circuit_1.update()
-                circuit_2.update()
-
-                unitary_1 = circuit_1.get_unitary()
-                unitary_2 = circuit_2.get_unitary()
-
-                # Perform diagonalization of the unitary blocks
-                circuit_1, diagonal = self.two_qubit_decomposition.apply_unitary_up_to_diagonal(
-                    self.output_framework(2),
-                    unitary_1,
-                    [0, 1]
-                )
-                circuit_2 = self.two_qubit_decomposition.prepare_unitary(unitary_2 @ diagonal)
-
-                # Update the blocks
-                qsd_blocks[block_index] = circuit_1.circuit_log
-                qsd_blocks[block_index + 1] = circuit_2.circuit_log
-
-            # Undo the qubit mapping
-            for block in qsd_blocks: # type: ignore
-                for operation in block: # type: ignore
-                    for key in set(operation.keys()).intersection(QUBIT_KEYS):
-                        operation[key] = qubit_indices[0] if operation[key] == 0 else qubit_indices[1]
-
-            # Reconstruct the circuit with the modified blocks in alternating order
-            circuit.reset()
-
-            circuit.circuit_log.extend(circuit_blocks.pop(0))
-
-            for qsd_block, circuit_block in zip(qsd_blocks, circuit_blocks):
-                circuit.circuit_log.extend(qsd_block)
-                circuit.circuit_log.extend(circuit_block)
-
-            # Update the circuit to reconstruct the circuit from the modified circuit log
-            circuit.update()
-
-        # Apply the Shannon decomposition to the circuit
-        quantum_shannon_decomposition(circuit, qubit_indices, unitary.data, recursion_depth=0) # type: ignore
-
-        return circuit
\ No newline at end of file
+# Copyright 2023-2024 Qualition Computing LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://github.com/Qualition/quick/blob/main/LICENSE
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Shende's Shannon decomposition for preparing quantum unitary operators
+using multiplexed RY and RZ gates.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ShannonDecomposition"]
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from itertools import islice
+import numpy as np
+from numpy.typing import NDArray
+import scipy.linalg # type: ignore
+from scipy.linalg.blas import zgemm # type: ignore
+from typing import SupportsIndex, TYPE_CHECKING
+
+import quick
+if TYPE_CHECKING:
+    from quick.circuit import Circuit
+from quick.circuit.circuit_utils import decompose_multiplexor_rotations
+from quick.predicates import is_identity_matrix
+from quick.primitives import Operator
+from quick.synthesis.unitarypreparation import UnitaryPreparation
+
+# Constants
+QUBIT_KEYS = frozenset([
+    "qubit_index", "control_index", "target_index"
+])
+
+# Threshold below which a rotation angle is treated as zero; matches the
+# angle normalization tolerance used by `quick.circuit.Circuit`
+EPSILON = 1e-10
+
+# Cache of synthesized two-qubit blocks keyed by a fingerprint of the
+# unitary and the qubit indices it acts on; cleared on every top-level
+# `apply_unitary` call
+_TWO_QUBIT_CACHE: dict[tuple[bytes, tuple[int, ...]], list[dict]] = {}
+
+# LAPACK cosine-sine decomposition routine and its workspace query,
+# resolved once for complex128
+_ZUNCSD, _ZUNCSD_LWORK = scipy.linalg.get_lapack_funcs(
+    ("uncsd", "uncsd_lwork"), dtype=np.complex128
+)
+
+# Workspace sizes for the cosine-sine decomposition keyed by the half
+# dimension; the recursion revisits each dimension many times, so the
+# workspace query is only issued once per size
+_CSD_LWORK_CACHE: dict[int, tuple[int, int]] = {}
+
+# Deepest recursion level at which the two demultiplexor branches are
+# dispatched to worker threads; below this the matrices are large enough
+# for the GIL-releasing LAPACK calls to dominate the thread overhead
+_PARALLEL_MAX_DEPTH = 2
+
+# Smallest half-block dimension worth a worker thread
+_PARALLEL_MIN_HALF = 8
+
+
+def _cossin_blocks(
+        unitary: NDArray[np.complex128],
+        half: int
+    ) -> tuple[
+        tuple[NDArray[np.complex128], NDArray[np.complex128]],
+        NDArray[np.float64],
+        tuple[NDArray[np.complex128], NDArray[np.complex128]]
+    ]:
+    """ Compute the cosine-sine decomposition of a unitary matrix split
+    into four equal blocks.
+
+    Notes
+    -----
+    This calls LAPACK's `zuncsd` directly with a cached workspace size,
+    bypassing the input validation and batching machinery that
+    `scipy.linalg.cossin` runs on every call. The inputs here are always
+    square complex128 unitaries split at the midpoint, so the checks are
+    redundant on this hot path. f2py still allocates the output arrays
+    per call; only the workspace query is amortized.
+
+    Parameters
+    ----------
+    `unitary` : NDArray[np.complex128]
+        The unitary matrix to decompose.
+    `half` : int
+        Half of the matrix dimension, i.e., the block size.
+
+    Returns
+    -------
+    `(u1, u2)` : tuple[NDArray[np.complex128], NDArray[np.complex128]]
+        The left block-diagonal factors.
+    `theta` : NDArray[np.float64]
+        The rotation angles in radians.
+    `(v1h, v2h)` : tuple[NDArray[np.complex128], NDArray[np.complex128]]
+        The conjugate-transposed right block-diagonal factors.
+
+    Raises
+    ------
+    ValueError
+        - If an illegal value is passed to `zuncsd`.
+    scipy.linalg.LinAlgError
+        - If `zuncsd` does not converge.
+    """
+    lwork = _CSD_LWORK_CACHE.get(half)
+    if lwork is None:
+        work, rwork, _ = _ZUNCSD_LWORK(m=2 * half, p=half, q=half)
+        lwork = (int(work.real), int(rwork))
+        _CSD_LWORK_CACHE[half] = lwork
+
+    *_, theta, u1, u2, v1h, v2h, info = _ZUNCSD(
+        x11=unitary[:half, :half], x12=unitary[:half, half:],
+        x21=unitary[half:, :half], x22=unitary[half:, half:],
+        trans=False, signs=False,
+        lwork=lwork[0], lrwork=lwork[1]
+    )
+
+    if info < 0:
+        raise ValueError(f"Illegal value in argument {-info} of internal zuncsd.")
+    if info > 0:
+        raise scipy.linalg.LinAlgError(f"zuncsd did not converge: {info}.")
+
+    return (u1, u2), theta, (v1h, v2h)
+
+
+def _unitary_fingerprint(unitary: NDArray[np.complex128]) -> bytes:
+    """ Compute a canonical fingerprint of a unitary matrix.
+
+    Notes
+    -----
+    The matrix is rounded before hashing to collapse floating-point noise
+    between structurally identical sub-blocks.
+
+    Parameters
+    ----------
+    `unitary` : NDArray[np.complex128]
+        The unitary matrix.
+
+    Returns
+    -------
+    bytes
+        The fingerprint digest.
+    """
+    return hashlib.blake2b(
+        np.ascontiguousarray(np.round(unitary, 12)).tobytes(),
+        digest_size=16
+    ).digest()
+
+
+def _operations_fingerprint(operations: list[dict]) -> tuple:
+    """ Compute a hashable fingerprint of a sequence of gate operations.
+
+    Notes
+    -----
+    Nested `definition` entries are excluded as they are fully determined
+    by the remaining gate parameters.
+
+    Parameters
+    ----------
+    `operations` : list[dict]
+        The gate operations as stored in `circuit_log`.
+
+    Returns
+    -------
+    tuple
+        The fingerprint of the operations.
+    """
+    return tuple(
+        (operation["gate"],) + tuple(
+            (key, repr(value))
+            for key, value in operation.items()
+            if key not in ("gate", "definition")
+        )
+        for operation in operations
+    )
+
+
+def _splice_fragment(
+        circuit: Circuit,
+        fragment: Circuit,
+        fragment_blocks: list[list[int]],
+        a2_qsd_blocks: list[list[int]]
+    ) -> None:
+    """ Splice the gate log of a fragment circuit onto `circuit`, shifting
+    the fragment's A.2 block ranges by the insertion offset.
+
+    Notes
+    -----
+    Only the gate log is transferred; the framework state of `circuit`
+    is rebuilt from the log by the `circuit.update()` call inside the
+    A.2 optimization, which always runs at the top of the recursion.
+
+    Parameters
+    ----------
+    `circuit` : quick.circuit.Circuit
+        Quantum circuit receiving the fragment.
+    `fragment` : quick.circuit.Circuit
+        Circuit holding the gates synthesized for one branch.
+    `fragment_blocks` : list[list[int]]
+        Two-qubit block index ranges local to the fragment's gate log.
+    `a2_qsd_blocks` : list[list[int]]
+        Accumulator of block index ranges relative to `circuit`'s gate log.
+    """
+    offset = len(circuit.circuit_log)
+    circuit.circuit_log.extend(fragment.circuit_log)
+
+    for start, end in fragment_blocks:
+        a2_qsd_blocks.append([start + offset, end + offset])
+
+
+def _quantum_shannon_decomposition(
+        circuit: Circuit,
+        qubit_indices: list[int],
+        unitary: NDArray[np.complex128],
+        decomposer: ShannonDecomposition,
+        a2_qsd_blocks: list[list[int]],
+        recursion_depth: int=0
+    ) -> None:
+    """ Decompose n-qubit unitary into CX/RY/RZ/CX gates, preserving global phase.
+
+    Notes
+    -----
+    Using cosine-sine decomposition, the unitary matrix is decomposed into a series of
+    single-qubit rotations and CX gates. The most significant qubit is then decomposed
+    into a series of RY rotations and CX gates, and the process is repeated recursively
+    until the unitary is fully decomposed.
+
+    ```
+      ┌───┐               ┌───┐
+    ──┤   ├──      ────□──┤ Ry├──□───
+      │ U │    =     ┌─┴─┐└─┬─┘┌─┴─┐
+    /─┤   ├──      /─┤ U ├──□──┤ V ├─
+      └───┘          └───┘     └───┘
+    ```
+
+    Parameters
+    ----------
+    `circuit` : quick.circuit.Circuit
+        Quantum circuit to append operations to.
+    `qubit_indices` : list[int]
+        The qubits to apply the unitary to.
+    `unitary` : NDArray[np.complex128]
+        N-qubit unitary matrix to be decomposed.
+    `decomposer` : quick.synthesis.unitarypreparation.ShannonDecomposition
+        The decomposition instance providing the base-case synthesizers
+        and the output framework.
+    `a2_qsd_blocks` : list[list[int]]
+        Accumulator of two-qubit block index ranges for the A.2 optimization.
+    `recursion_depth` : int, optional, default=0
+        The current recursion depth.
+
+    Raises
+    ------
+    ValueError
+        - If the u matrix is non-unitary
+        - If the u matrix is not of shape (2^n,2^n)
+    """
+    dim = unitary.shape[0]
+
+    # An identity block contributes no gates, so the whole branch of
+    # the recursion can be skipped
+    if is_identity_matrix(unitary, rtol=0, atol=1e-12):
+        return
+
+    # Explicit decomposition for one and two qubit unitaries
+    # This is the base case for the recursion
+    if dim == 2:
+        decomposer.one_qubit_decomposition.apply_unitary(circuit, unitary, qubit_indices)
+        return
+
+    elif dim == 4:
+        # The leaf path is hit 4^(n-2) times per decomposition, so the
+        # gate log is bound locally to avoid repeated attribute lookups
+        log = circuit.circuit_log
+        current_index = len(log)
+
+        # Structurally identical sub-blocks recur across branches of
+        # the recursion, so the synthesized gate sequence is cached
+        # by unitary fingerprint and replayed on a hit
+        cache_key = (_unitary_fingerprint(unitary), tuple(qubit_indices))
+        cached_operations = _TWO_QUBIT_CACHE.get(cache_key)
+
+        if cached_operations is not None:
+            for operation in cached_operations:
+                getattr(circuit, operation["gate"])(**{
+                    key: value for key, value in operation.items()
+                    if key not in ("gate", "definition")
+                })
+        else:
+            decomposer.two_qubit_apply(circuit, unitary, qubit_indices)
+            _TWO_QUBIT_CACHE[cache_key] = [
+                operation.copy() for operation in log[current_index:]
+            ]
+
+        # Store the block for A.2 optimization
+        if recursion_depth > 0:
+            a2_qsd_blocks.append([current_index, len(log)])
+
+        return
+
+    # If the unitary is already block-diagonal along the split, it is
+    # exactly a multiplexor; demultiplex the diagonal blocks directly
+    # and skip the cosine-sine decomposition
+    # The Frobenius norms of the off-diagonal blocks cost O(N^2) and
+    # save an O(N^3) decomposition when they vanish
+    half = dim // 2
+    if (
+        np.linalg.norm(unitary[:half, half:]) < 1e-12
+        and np.linalg.norm(unitary[half:, :half]) < 1e-12
+    ):
+        _demultiplexor(
+            circuit,
+            qubit_indices,
+            unitary[:half, :half],
+            unitary[half:, half:],
+            decomposer,
+            a2_qsd_blocks,
+            recursion_depth
+        )
+
+        # The A.2 optimization still runs over the blocks the
+        # demultiplexor registered
+        if recursion_depth == 0:
+            _a2_optimization(circuit, qubit_indices, a2_qsd_blocks, decomposer)
+
+        return
+
+    # Perform cosine-sine decomposition per Theorem 10
+    (u1, u2), theta, (v1, v2) = _cossin_blocks(unitary, half)
+
+    # Perform A.1 optimization from Shende et al.
+    # This optimization reduces the number of CX gates by 1/3 * 4^(n-2) - 1
+    num_angles = len(theta)
+
+    if recursion_depth <= _PARALLEL_MAX_DEPTH and half >= _PARALLEL_MIN_HALF:
+        # The two demultiplexors operate on disjoint matrices and the
+        # LAPACK calls inside them release the GIL, so at the top levels
+        # each branch is synthesized into its own fragment circuit on a
+        # worker thread and the fragments are spliced back in order
+        left_fragment = decomposer.output_framework(circuit.num_qubits)
+        middle_fragment = decomposer.output_framework(circuit.num_qubits)
+        right_fragment = decomposer.output_framework(circuit.num_qubits)
+        left_blocks: list[list[int]] = []
+        right_blocks: list[list[int]] = []
+
+        # Negate in place; `u2` is freshly produced by cossin, so no other
+        # reference observes the mutation
+        np.negative(u2[:, num_angles // 2:], out=u2[:, num_angles // 2:])
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            left_future = executor.submit(
+                _demultiplexor, left_fragment, qubit_indices,
+                v1, v2, decomposer, left_blocks, recursion_depth
+            )
+            right_future = executor.submit(
+                _demultiplexor, right_fragment, qubit_indices,
+                u1, u2, decomposer, right_blocks, recursion_depth
+            )
+
+            # The multiplexed RY only depends on the CS angles, so it is
+            # emitted on the main thread while the branches run
+            _ucry_to_cz_ry(
+                middle_fragment, qubit_indices[:-1], qubit_indices[-1], 2 * theta
+            )
+
+            left_future.result()
+            right_future.result()
+
+        _splice_fragment(circuit, left_fragment, left_blocks, a2_qsd_blocks)
+        _splice_fragment(circuit, middle_fragment, [], a2_qsd_blocks)
+        _splice_fragment(circuit, right_fragment, right_blocks, a2_qsd_blocks)
+
+    else:
+        # Left multiplexed circuit
+        _demultiplexor(circuit, qubit_indices, v1, v2, decomposer, a2_qsd_blocks, recursion_depth)
+
+        # The multiplexed RY gate is replaced by its equivalent CZ-RY gate
+        # and merge final CZ gate with the neighboring right-side generic
+        # multiplexer to apply A.1 optimization
+        # This removes one CX gate at each step of the recursion
+        # The angles stay a float64 array end to end; boxing them into a list
+        # of Python floats here is unnecessary
+        _ucry_to_cz_ry(circuit, qubit_indices[:-1], qubit_indices[-1], 2 * theta)
+        # Negate in place; `u2` is freshly produced by cossin, so no other
+        # reference observes the mutation
+        np.negative(u2[:, num_angles // 2:], out=u2[:, num_angles // 2:])
+
+        # Right multiplexed circuit
+        _demultiplexor(circuit, qubit_indices, u1, u2, decomposer, a2_qsd_blocks, recursion_depth)
+
+    # Once the recursion reaches the base case, apply the A.2 optimization
+    # to reduce the number of CX gates by 4^(n-2) - 1
+    if recursion_depth == 0:
+        _a2_optimization(circuit, qubit_indices, a2_qsd_blocks, decomposer)
+
+
+def _demultiplexor(
+        circuit: Circuit,
+        demux_qubits: list[int],
+        unitary_1: NDArray[np.complex128],
+        unitary_2: NDArray[np.complex128],
+        decomposer: ShannonDecomposition,
+        a2_qsd_blocks: list[list[int]],
+        recursion_depth: int=0
+    ) -> None:
+    """ Decompose a multiplexor defined by a pair of unitary matrices operating on
+    the same subspace per Theorem 12.
+
+    That is, decompose
+
+    ```
+      ctrl     ────□────
+                ┌──┴──┐
+      target  /─┤     ├─
+                └─────┘
+    ```
+
+    represented by the block diagonal matrix
+
+    ```
+        ┏         ┓
+        ┃ U1      ┃
+        ┃      U2 ┃
+        ┗         ┛
+    ```
+
+    to
+
+    ```
+                     ┌───┐
+      ctrl    ───────┤ Rz├──────
+                ┌───┐└─┬─┘┌───┐
+      target  /─┤ W ├──□──┤ V ├─
+                └───┘     └───┘
+    ```
+
+    by means of simultaneous unitary diagonalization.
+
+    Parameters
+    ----------
+    `circuit` : quick.circuit.Circuit
+        Quantum circuit to append operations to.
+    `demux_qubits` : list[int]
+        Subset of total qubits involved in this unitary gate.
+    `unitary_1` : NDArray[np.complex128]
+        Upper-left quadrant of total unitary to be decomposed (see diagram).
+    `unitary_2` : NDArray[np.complex128]
+        Lower-right quadrant of total unitary to be decomposed (see diagram).
+    `decomposer` : quick.synthesis.unitarypreparation.ShannonDecomposition
+        The decomposition instance providing the base-case synthesizers
+        and the output framework.
+    `a2_qsd_blocks` : list[list[int]]
+        Accumulator of two-qubit block index ranges for the A.2 optimization.
+    `recursion_depth` : int, optional, default=0
+        The current recursion depth.
+    """
+    # Compute the product of `unitary_1` and the conjugate transpose of `unitary_2`
+    # The conjugate transpose is folded into the BLAS call itself, so no
+    # explicit `.conj().T` copy of `unitary_2` is materialized
+    u = zgemm(1.0, unitary_1, unitary_2, trans_b=2)
+
+    # Perform eigenvalue decomposition to find the eigenvalues and eigenvectors of u
+    # This step is crucial because it allows us to express the unitary transformation
+    # in terms of its eigenvalues and eigenvectors, which simplifies further calculations
+    # Since u is unitary (hence normal), the complex Schur form is always
+    # diagonal and yields its eigendecomposition directly; a single Schur
+    # call avoids the Hermitian predicate check on every invocation
+    # `u` is a temporary produced by the zgemm call above, so the Schur
+    # form is written into its buffer instead of a fresh allocation
+    eigenvalues, eigenvectors = scipy.linalg.schur( # type: ignore
+        u, output="complex", overwrite_a=True
+    )
+    eigenvalues = eigenvalues.diagonal()
+
+    # Take the square root of the eigenvalues to obtain the singular values
+    # This is necessary because the singular values provide a more convenient form
+    # for constructing the diagonal matrix D, which is used in the final decomposition
+    # The complex Schur form yields complex128 eigenvalues, so plain
+    # `np.sqrt` takes the principal branch without the dtype dispatch
+    # that `np.emath.sqrt` performs
+    eigenvalues_sqrt = np.sqrt(eigenvalues)
+
+    # Compute the matrix W by scaling the rows of V^dagger @ `unitary_2`
+    # with the singular values
+    # Left-multiplying by a diagonal matrix is just a per-row scale, so
+    # broadcasting replaces the O(n^3) diagonal matrix product
+    W = eigenvalues_sqrt[:, None] * zgemm(1.0, eigenvectors, unitary_2, trans_a=2)
+
+    # Apply the left gate
+    _quantum_shannon_decomposition(
+        circuit, demux_qubits[:-1], W, decomposer, a2_qsd_blocks, recursion_depth + 1
+    )
+
+    # Apply multiplexed RZ gate
+    # angle(conj(z)) == -angle(z), so negating the arctan2 result
+    # avoids conjugating the whole eigenvalue array first
+    # The array is passed as-is; `process_gate_params` converts it to a
+    # list exactly once when the gate is logged
+    angles = -2.0 * np.arctan2(
+        eigenvalues_sqrt.imag, eigenvalues_sqrt.real
+    )
+
+    circuit.UCRZ(angles, demux_qubits[:-1], demux_qubits[-1])
+
+    # Apply the right gate
+    # The complex Schur form already returns complex128 eigenvectors,
+    # so np.asarray is a no-op here rather than the forced copy that
+    # .astype(complex) made on every call
+    _quantum_shannon_decomposition(
+        circuit,
+        demux_qubits[:-1],
+        np.asarray(eigenvectors, dtype=np.complex128),
+        decomposer,
+        a2_qsd_blocks,
+        recursion_depth + 1
+    )
+
+
+def _ucry_to_cz_ry(
+        circuit: Circuit,
+        control_indices: int | list[int],
+        target_index: int,
+        angles: NDArray[np.float64]
+    ) -> None:
+    """ Get the multiplexed RY gate in terms of CZ-RY. This
+    is used in the A.1 optimization.
+
+    Notes
+    -----
+    As the initial controlled-Z gate is diagonal, it may be absorbed into the
+    neighboring generic multiplexor. This saves one CX gate at each step of the
+    recursion, for the total savings of (4^(n-l) -1)/3 CX gates.
+
+    Parameters
+    ----------
+    `circuit` : quick.circuit.Circuit
+        Quantum circuit to append operations to.
+    `control_indices` : int | list[int]
+        List of control qubits for the CZ gate.
+    `target_index` : int
+        Target qubit for the CZ gate.
+    `angles` : NDArray[np.float64]
+        List of angles for the RY gates.
+    """
+    num_angles = len(angles)
+
+    if isinstance(control_indices, int):
+        control_indices = [control_indices]
+
+    # If there are no control qubits, apply the RY gate directly
+    # to the target qubit
+    if not control_indices:
+        circuit.RY(angles[0], target_index)
+        return
+
+    # Calculate rotation angles for a multiplexed Pauli Rotation gate
+    # with a CX gate at the end of the circuit
+    # The decomposition kernel is JIT-compiled and expects float64
+    angles = decompose_multiplexor_rotations(
+        np.asarray(angles, dtype=np.float64), 0, num_angles, False
+    )
+
+    # Flag the effectively-zero rotations in a single vectorized
+    # compare; their RY gates are identity and can be skipped, while
+    # the CZ pattern must be emitted regardless
+    active_angles = np.abs(angles) > EPSILON
+
+    for i, angle in enumerate(angles):
+        if active_angles[i]:
+            circuit.RY(angle, target_index)
+
+        if not i == len(angles) - 1:
+            # The control index is the number of trailing zeros of i + 1,
+            # extracted arithmetically instead of through a binary string
+            control_index = ((i + 1) & -(i + 1)).bit_length() - 1
+        else:
+            # Handle special case for last angle
+            control_index = len(control_indices) - 1
+
+        # Leave off last CZ for merging with neighboring multiplexor as part
+        # of A.1 optimization
+        if i < num_angles - 1:
+            circuit.CZ(control_indices[control_index], target_index)
+
+
+def _a2_optimization(
+        circuit: Circuit,
+        qubit_indices: list[int],
+        a2_qsd_blocks: list[list[int]],
+        decomposer: ShannonDecomposition
+    ) -> None:
+    """ Extract diagonals to improve decomposition of two-qubit gates. This
+    is used in the A.2 optimization.
+
+    Notes
+    -----
+    We use Theorem 14 to decompose the rightmost two-qubit operator; migrate
+    the diagonal through the select bits of the multiplexor to the left, and
+    join it with the two-qubit operator on the other side.
+
+    Now we decompose this operator, and continue the process. Since we save
+    one CX in the implementation of every two-qubit gate but the last, we
+    improve the l = 2, c_l = 3 count by 4^(n - 2) - 1 gates.
+
+    Parameters
+    ----------
+    `circuit` : quick.circuit.Circuit
+        Quantum circuit to append operations to.
+    `qubit_indices` : list[int]
+        The two qubits the blocks act on.
+    `a2_qsd_blocks` : list[list[int]]
+        List of blocks to apply A.2 optimization to.
+    `decomposer` : quick.synthesis.unitarypreparation.ShannonDecomposition
+        The decomposition instance providing the base-case synthesizers
+        and the output framework.
+    """
+    # If there are no blocks, or only one block which means
+    # no neighbors to merge diagonal into, then there is nothing to merge
+    # The framework circuit may still be stale if fragments were spliced
+    # into the gate log, so it is rebuilt from the log before returning;
+    # fewer than two blocks implies a near-trivial log, so this is cheap
+    if len(a2_qsd_blocks) < 2:
+        circuit.update()
+        return
+
+    # Break apart the circuit into the blocks that need to be changed
+    # and the blocks that will remain the same
+    # The unchanged segments are kept as (start, end) index pairs into
+    # the original log instead of copied sub-lists; `reset()` rebinds
+    # `circuit_log` to a fresh list, so the original stays valid
+    original_log = circuit.circuit_log
+
+    qsd_blocks: list[list[dict]] = []
+    circuit_block_ranges: list[tuple[int, int]] = []
+
+    circuit_block_ranges.append((0, a2_qsd_blocks[0][0]))
+
+    for block_index, block in enumerate(a2_qsd_blocks[:-1]):
+        qsd_blocks.append(original_log[block[0]:block[1]])
+        circuit_block_ranges.append((block[1], a2_qsd_blocks[block_index + 1][0]))
+
+    qsd_blocks.append(original_log[a2_qsd_blocks[-1][0]:a2_qsd_blocks[-1][1]])
+    circuit_block_ranges.append((a2_qsd_blocks[-1][1], len(original_log)))
+
+    # Identical QSD blocks recur across the recursion, so the replayed
+    # unitaries are memoized by a fingerprint of their gate operations
+    unitary_cache: dict[tuple, NDArray[np.complex128]] = {}
+
+    # Persistent scratch circuits for replaying the blocks; `update()`
+    # rebuilds the whole circuit from the assigned log, so the scratch
+    # can be rebound per iteration instead of constructed anew
+    scratch_1 = decomposer.output_framework(2)
+    scratch_2 = decomposer.output_framework(2)
+
+    # Extract the blocks from the circuit
+    for block_index in range(len(qsd_blocks) - 1):
+        scratch_1.circuit_log = qsd_blocks[block_index]
+        scratch_2.circuit_log = qsd_blocks[block_index + 1]
+
+        # Update the circuit to reconstruct the circuit from the modified circuit log
+        # As mentioned, we need to map the qubits to 0 and 1 to extract the 4x4 unitaries
+        if block_index == 0:
+            for operation in scratch_1.circuit_log:
+                for key in set(operation.keys()).intersection(QUBIT_KEYS):
+                    operation[key] = 0 if operation[key] == qubit_indices[0] else 1
+
+        for operation in scratch_2.circuit_log:
+            for key in set(operation.keys()).intersection(QUBIT_KEYS):
+                operation[key] = 0 if operation[key] == qubit_indices[0] else 1
+
+        # Only replay a block when its gate sequence has not been
+        # simulated before
+        key_1 = _operations_fingerprint(scratch_1.circuit_log)
+        unitary_1 = unitary_cache.get(key_1)
+        if unitary_1 is None:
+            scratch_1.update()
+            unitary_1 = scratch_1.get_unitary()
+            unitary_cache[key_1] = unitary_1
+
+        key_2 = _operations_fingerprint(scratch_2.circuit_log)
+        unitary_2 = unitary_cache.get(key_2)
+        if unitary_2 is None:
+            scratch_2.update()
+            unitary_2 = scratch_2.get_unitary()
+            unitary_cache[key_2] = unitary_2
+
+        # Perform diagonalization of the unitary blocks
+        circuit_1, diagonal = decomposer.two_qubit_decomposition.apply_unitary_up_to_diagonal(
+            decomposer.output_framework(2),
+            unitary_1,
+            [0, 1]
+        )
+        circuit_2 = decomposer.two_qubit_decomposition.prepare_unitary(unitary_2 @ diagonal)
+
+        # Update the blocks
+        qsd_blocks[block_index] = circuit_1.circuit_log
+        qsd_blocks[block_index + 1] = circuit_2.circuit_log
+
+    # Undo the qubit mapping
+    for block in qsd_blocks: # type: ignore
+        for operation in block: # type: ignore
+            for key in set(operation.keys()).intersection(QUBIT_KEYS):
+                operation[key] = qubit_indices[0] if operation[key] == 0 else qubit_indices[1]
+
+    # Reconstruct the circuit with the modified blocks in alternating order
+    # `islice` streams the unchanged segments straight out of the
+    # original log without materializing intermediate sub-lists
+    circuit.reset()
+
+    circuit.circuit_log.extend(islice(original_log, *circuit_block_ranges[0]))
+
+    for qsd_block, block_range in zip(qsd_blocks, circuit_block_ranges[1:]):
+        circuit.circuit_log.extend(qsd_block)
+        circuit.circuit_log.extend(islice(original_log, *block_range))
+
+    # Update the circuit to reconstruct the circuit from the modified circuit log
+    circuit.update()
+
+
+class ShannonDecomposition(UnitaryPreparation):
+    """ `quick.ShannonDecomposition` is the class for preparing quantum operators
+    using Shannon decomposition.
+
+    Notes
+    -----
+    Shende's Shannon decomposition uses multiplexed RY and RZ gates to prepare the unitary
+    operator. This method scales exponentially with the number of qubits in terms of circuit
+    depth.
+
+    ```
+       ┌───┐               ┌───┐     ┌───┐     ┌───┐
+      ─┤   ├─       ───────┤ Rz├─────┤ Ry├─────┤ Rz├─────
+       │   │    ≃     ┌───┐└─┬─┘┌───┐└─┬─┘┌───┐└─┬─┘┌───┐
+     /─┤   ├─       /─┤   ├──□──┤   ├──□──┤   ├──□──┤   ├
+       └───┘          └───┘     └───┘     └───┘     └───┘
+    ```
+
+    The number of CX gates generated with the decomposition without optimizations is,
+
+    .. math::
+
+        \frac{9}{16} 4^n - \frac{3}{2} 2^n
+
+    With A.1 optimization the CX count is reduced by,
+
+    .. math::
+
+        \frac{1}{3} 4^{n - 2} - 1.
+
+    With A.2 optimization the CX count is reduced by,
+
+    .. math::
+
+        4^{n-2} - 1.
+
+    Both A.1 and A.2 optimizations are applied by default.
+
+    For more information on Shannon decomposition:
+    [1] Shende, Bullock, Markov.
+    Synthesis of Quantum Logic Circuits (2004)
+    https://arxiv.org/abs/quant-ph/0406176
+
+    Parameters
+    ----------
+    `output_framework` : type[quick.circuit.Circuit]
+        The quantum circuit framework.
+
+    Attributes
+    ----------
+    `output_framework` : type[quick.circuit.Circuit]
+        The quantum circuit framework.
+
+    Raises
+    ------
+    TypeError
+        - If the output framework is not a subclass of `quick.circuit.Circuit`.
+    """
+    def __init__(
+            self,
+            output_framework: type[Circuit]
+        ) -> None:
+
+        super().__init__(output_framework)
+
+        self.one_qubit_decomposition = quick.synthesis.gate_decompositions.OneQubitDecomposition(output_framework)
+        self.two_qubit_decomposition = quick.synthesis.gate_decompositions.TwoQubitDecomposition(output_framework)
+
+        # Pre-bound method used by the dim == 4 leaf of the recursion,
+        # which is hit 4^(n-2) times per decomposition; binding once
+        # skips two attribute lookups on every leaf
+        self.two_qubit_apply = self.two_qubit_decomposition.apply_unitary
+
+    def apply_unitary(
+            self,
+            circuit: Circuit,
+            unitary: NDArray[np.complex128] | Operator,
+            qubit_indices: int | Sequence[int]
+        ) -> Circuit:
+
+        if not isinstance(unitary, (np.ndarray, Operator)):
+            try:
+                unitary = np.array(unitary).astype(complex)
+            except (ValueError, TypeError):
+                raise TypeError(
+                    "The operator must be a numpy array or an Operator object. "
+                    f"Received {type(unitary)} instead."
+                )
+
+        if isinstance(unitary, np.ndarray):
+            unitary = Operator(unitary)
+
+        if isinstance(qubit_indices, SupportsIndex):
+            qubit_indices = [qubit_indices]
+
+        if not all(isinstance(qubit_index, SupportsIndex) for qubit_index in qubit_indices):
+            raise TypeError("All qubit indices must be integers.")
+
+        if not len(qubit_indices) == unitary.num_qubits:
+            raise ValueError("The number of qubit indices must match the number of qubits in the unitary.")
+
+        # Clear the two-qubit block cache so results stay deterministic
+        # across top-level calls
+        _TWO_QUBIT_CACHE.clear()
+
+        a2_qsd_blocks: list[list[int]] = []
+
+        # Apply the Shannon decomposition to the circuit
+        _quantum_shannon_decomposition(
+            circuit, qubit_indices, unitary.data, self, a2_qsd_blocks, recursion_depth=0 # type: ignore
+        )
+
+        return circuit
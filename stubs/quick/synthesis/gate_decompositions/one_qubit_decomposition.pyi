@@ -29,5 +29,9 @@ class OneQubitDecomposition(UnitaryPreparation):
     @staticmethod
     def params_zyz(U: NDArray[np.complex128]) -> tuple[float, tuple[float, float, float]]: ...
     @staticmethod
+    def params_zyz_batch(U: NDArray[np.complex128]) -> tuple[NDArray[np.float64], tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]]: ...
+    @staticmethod
+    def params_u3_batch(U: NDArray[np.complex128]) -> tuple[NDArray[np.float64], tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]]: ...
+    @staticmethod
     def params_u3(U: NDArray[np.complex128]) -> tuple[float, tuple[float, float, float]]: ...
     def apply_unitary(self, circuit: Circuit, unitary: NDArray[np.complex128] | Operator, qubit_indices: int | Sequence[int]) -> Circuit: ...
@@ -64,6 +64,34 @@ class TestOneQubitDecomposition:
         # Check that the circuit is equivalent to the original unitary matrix
         assert_almost_equal(circuit.get_unitary(), unitary_matrix, decimal=8)
 
+    def test_params_zyz_batch(self) -> None:
+        """ Test the batched ZYZ parameter extraction against the scalar variant.
+        """
+        # Generate a batch of random unitary matrices
+        unitary_matrices = unitary_group.rvs(2, size=16).astype(complex)
+
+        # Calculate the batched ZYZ parameters
+        alpha, (theta, phi, lam) = OneQubitDecomposition.params_zyz_batch(unitary_matrices)
+
+        # Check that each entry matches the scalar decomposition
+        for i, unitary_matrix in enumerate(unitary_matrices):
+            alpha_i, (theta_i, phi_i, lam_i) = OneQubitDecomposition.params_zyz(unitary_matrix)
+            assert_almost_equal([alpha[i], theta[i], phi[i], lam[i]], [alpha_i, theta_i, phi_i, lam_i], decimal=10)
+
+    def test_params_u3_batch(self) -> None:
+        """ Test the batched U3 parameter extraction against the scalar variant.
+        """
+        # Generate a batch of random unitary matrices
+        unitary_matrices = unitary_group.rvs(2, size=16).astype(complex)
+
+        # Calculate the batched U3 parameters
+        phase, (theta, phi, lam) = OneQubitDecomposition.params_u3_batch(unitary_matrices)
+
+        # Check that each entry matches the scalar decomposition
+        for i, unitary_matrix in enumerate(unitary_matrices):
+            phase_i, (theta_i, phi_i, lam_i) = OneQubitDecomposition.params_u3(unitary_matrix)
+            assert_almost_equal([phase[i], theta[i], phi[i], lam[i]], [phase_i, theta_i, phi_i, lam_i], decimal=10)
+
     def test_invalid_basis_fail(self) -> None:
         """ Test that an invalid basis raises an error.
         """